@@ -0,0 +1,61 @@
+"""
+Canonical keys for video URLs.
+
+The same video is reachable through many URL shapes (watch pages, short links,
+Shorts, tracking parameters), so anything keyed by URL should go through here.
+"""
+from __future__ import annotations
+
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+YOUTUBE_HOSTS = {"youtube.com", "m.youtube.com", "music.youtube.com", "youtu.be", "youtube-nocookie.com"}
+YOUTUBE_PATH_ID = re.compile(r"^/(?:shorts|embed|live|v)/([A-Za-z0-9_-]{11})")
+YOUTUBE_ID = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
+# Query parameters that never change which video is served
+TRACKING_PARAMS = {"si", "feature", "fbclid", "gclid", "igshid", "t", "start"}
+
+
+def canonical_url(url: str) -> str:
+    """
+    Return a stable key identifying the video behind a URL.
+
+    YouTube URLs collapse to "youtube:<video id>". Other URLs are normalized
+    (lowercase host, no "www.", no fragment, no tracking parameters).
+    """
+    url = url.strip()
+    if "//" not in url:
+        # "youtube.com/watch?v=..." - urlsplit would read the host as a path
+        url = f"https://{url}"
+    parts = urlsplit(url)
+    host = parts.netloc.lower().split("@")[-1].split(":")[0]
+    if host.startswith("www."):
+        host = host[4:]
+
+    if host in YOUTUBE_HOSTS:
+        video_id = _youtube_id(host, parts.path, parts.query)
+        if video_id:
+            return f"youtube:{video_id}"
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in TRACKING_PARAMS and not key.startswith("utm_")
+    ]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(((parts.scheme or "https").lower(), host, path, urlencode(sorted(query)), ""))
+
+
+def _youtube_id(host: str, path: str, query: str) -> str | None:
+    """Pull the 11-character video id out of a YouTube URL, if present."""
+    if host == "youtu.be":
+        candidate = path.strip("/").split("/")[0]
+        return candidate if YOUTUBE_ID.match(candidate) else None
+
+    match = YOUTUBE_PATH_ID.match(path)
+    if match:
+        return match.group(1)
+
+    candidate = dict(parse_qsl(query)).get("v", "")
+    return candidate if YOUTUBE_ID.match(candidate) else None
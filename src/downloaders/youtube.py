@@ -2,13 +2,13 @@ import yt_dlp
 import tempfile
 import os
 from pathlib import Path
-from typing import Optional
 from .base import VideoInfo, VideoDownloader
 
 
 class YouTubeDownloader:
     def __init__(self):
-        self._temp_dir: Optional[tempfile.TemporaryDirectory] = None
+        # One temp dir per download so concurrent downloads don't clobber each other
+        self._temp_dirs: dict[Path, tempfile.TemporaryDirectory] = {}
 
     def supports(self, url: str) -> bool:
         """Check if the URL is a supported YouTube URL."""
@@ -22,8 +22,8 @@ class YouTubeDownloader:
     def download(self, url: str) -> VideoInfo:
         """Download a YouTube video and return VideoInfo."""
         # Create temp directory (not using 'with' so it persists)
-        self._temp_dir = tempfile.TemporaryDirectory()
-        temp_dir_path = self._temp_dir.name
+        temp_dir = tempfile.TemporaryDirectory()
+        temp_dir_path = temp_dir.name
         
         ydl_opts = {
             'outtmpl': os.path.join(temp_dir_path, '%(title)s.%(ext)s'),
@@ -46,10 +46,12 @@ class YouTubeDownloader:
             files = [f for f in temp_path.iterdir() if f.is_file()]
             
             if not files:
+                temp_dir.cleanup()
                 raise FileNotFoundError(f"No video file found in {temp_dir_path}")
             
             # Take the first (and should be only) file
             video_path = files[0]
+            self._temp_dirs[video_path] = temp_dir
             
             return VideoInfo(
                 title=info.get('title', 'Unknown'),
@@ -66,6 +68,6 @@ class YouTubeDownloader:
             video_info.file_path.unlink()
         
         # Clean up the temp directory
-        if self._temp_dir:
-            self._temp_dir.cleanup()
-            self._temp_dir = None
\ No newline at end of file
+        temp_dir = self._temp_dirs.pop(video_info.file_path, None)
+        if temp_dir:
+            temp_dir.cleanup()
\ No newline at end of file
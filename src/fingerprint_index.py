@@ -0,0 +1,183 @@
+"""
+Index of previously extracted recipes keyed by video fingerprint.
+
+Frame hashes go into a BK-tree so nearest-neighbour lookups by Hamming
+distance only visit a small part of the index. Candidates are then scored on
+all their frames plus audio to get a match confidence.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .processing.fingerprint import HASH_BITS, Fingerprint, hamming
+from .schemas import Recipe
+
+
+class BKTree:
+    """Metric tree over 64-bit hashes, each node carrying the entry ids that produced it."""
+
+    def __init__(self):
+        # node = [hash, entry ids, {distance: child node}]
+        self._root: list | None = None
+
+    def add(self, value: int, entry_id: int) -> None:
+        if self._root is None:
+            self._root = [value, [entry_id], {}]
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(entry_id)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [entry_id], {}]
+                return
+            node = child
+
+    def search(self, value: int, radius: int) -> list[tuple[int, int]]:
+        """Return (distance, entry id) for every stored hash within `radius` bits."""
+        results = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= radius:
+                results.extend((distance, entry_id) for entry_id in node[1])
+            # Triangle inequality: only children in [d - r, d + r] can hold matches
+            for child_distance, child in node[2].items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        return results
+
+
+@dataclass
+class Match:
+    recipe: Recipe
+    confidence: float
+    fingerprint: Fingerprint
+
+
+class FingerprintIndex:
+    """
+    Thread-safe store of (Fingerprint, Recipe) pairs.
+
+    Pass a path to persist the index between runs as a JSON-lines file that
+    each add appends to; without one it lives in memory only.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        threshold: float = 0.9,
+        candidate_radius: int = 12,
+        audio_weight: float = 0.25,
+    ):
+        self.path = Path(path) if path else None
+        self.threshold = threshold
+        self.candidate_radius = candidate_radius
+        self.audio_weight = audio_weight
+        self._entries: list[tuple[Fingerprint, Recipe]] = []
+        self._tree = BKTree()
+        self._lock = threading.Lock()
+        # Separate from _lock so lookups never wait on disk writes
+        self._file_lock = threading.Lock()
+
+        if self.path and self.path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, fingerprint: Fingerprint) -> Optional[Match]:
+        """Return the best stored recipe if its confidence reaches the threshold."""
+        if not fingerprint.informative_hashes:
+            return None
+
+        with self._lock:
+            candidates = set()
+            for value in fingerprint.informative_hashes:
+                candidates.update(entry_id for _, entry_id in self._tree.search(value, self.candidate_radius))
+
+            best: Optional[Match] = None
+            for entry_id in candidates:
+                stored, recipe = self._entries[entry_id]
+                confidence = self.similarity(fingerprint, stored)
+                if confidence >= self.threshold and (best is None or confidence > best.confidence):
+                    best = Match(recipe=recipe, confidence=confidence, fingerprint=stored)
+        return best
+
+    def add(self, fingerprint: Fingerprint, recipe: Recipe) -> None:
+        """Store a recipe under its fingerprint (and append it to disk, if persistent)."""
+        # Only flat frames: lookup() could never match it, so don't keep it
+        if not fingerprint.informative_hashes:
+            return
+
+        with self._lock:
+            self._insert(fingerprint, recipe)
+
+        if self.path:
+            line = json.dumps({
+                "fingerprint": fingerprint.to_dict(),
+                "recipe": recipe.model_dump(mode="json", exclude={"total_time_minutes"}),
+            })
+            with self._file_lock, self.path.open("a") as f:
+                f.write(line + "\n")
+
+    def similarity(self, a: Fingerprint, b: Fingerprint) -> float:
+        """
+        Confidence in [0, 1] that two fingerprints come from the same video.
+
+        Frames are matched to their closest counterpart in both directions and
+        the two scores averaged, so one shot shared by two otherwise different
+        videos isn't enough to match. Nearest-frame matching tolerates short
+        trims; the whole-track audio hash does not (trimming shifts every
+        window), so audio can only confirm a near-miss and never blocks a
+        visual match.
+        """
+        if not a.informative_hashes or not b.informative_hashes:
+            return 0.0
+
+        # Cheap gate: re-uploads keep roughly the same length
+        if a.duration_seconds and b.duration_seconds:
+            longest = max(a.duration_seconds, b.duration_seconds)
+            if abs(a.duration_seconds - b.duration_seconds) > max(3.0, 0.1 * longest):
+                return 0.0
+
+        visual = (_coverage(a.informative_hashes, b.informative_hashes)
+                  + _coverage(b.informative_hashes, a.informative_hashes)) / 2
+
+        if a.audio_hash is None or b.audio_hash is None:
+            return visual
+        audio = 1 - hamming(a.audio_hash, b.audio_hash) / HASH_BITS
+        return max(visual, (1 - self.audio_weight) * visual + self.audio_weight * audio)
+
+    def _insert(self, fingerprint: Fingerprint, recipe: Recipe) -> None:
+        entry_id = len(self._entries)
+        self._entries.append((fingerprint, recipe))
+        for value in fingerprint.informative_hashes:
+            self._tree.add(value, entry_id)
+
+    def _load(self) -> None:
+        text = self.path.read_text()
+        if text and not text.endswith("\n"):
+            # Terminate a half-written line so the next append starts cleanly
+            with self.path.open("a") as f:
+                f.write("\n")
+        for line in text.splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Blank line, or a write cut short by a crash
+            self._insert(Fingerprint.from_dict(entry["fingerprint"]), Recipe.model_validate(entry["recipe"]))
+
+
+def _coverage(hashes: list[int], others: list[int]) -> float:
+    """How well each hash in `hashes` is matched by its nearest hash in `others`."""
+    distances = [min(hamming(h, other) for other in others) for h in hashes]
+    return 1 - (sum(distances) / len(distances)) / HASH_BITS
@@ -0,0 +1,72 @@
+"""
+End-to-end recipe extraction: download -> frames -> transcript -> VLM.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Protocol
+
+from .downloaders.base import VideoDownloader
+from .downloaders.factory import get_downloader
+from .fingerprint_index import FingerprintIndex
+from .processing.audio import AudioTranscriber
+from .processing.fingerprint import VideoFingerprinter
+from .processing.frames import FrameExtractor
+from .schemas import Recipe
+from .vlm.base import VLMAdapter
+
+
+class Transcriber(Protocol):
+    def process_video(self, video_path: str | Path) -> str | None:
+        ...
+
+
+class RecipePipeline:
+    """
+    Turn a video URL into a Recipe.
+
+    Every stage is injectable so the pipeline can run against stubs
+    (no network, no API keys) in tests and local service runs.
+
+    With an index, each download is fingerprinted first; a re-upload of a
+    video we've already seen returns the stored Recipe without calling the
+    transcriber or the VLM.
+    """
+
+    def __init__(
+        self,
+        adapter: VLMAdapter,
+        extractor: FrameExtractor | None = None,
+        transcriber: Transcriber | None = None,
+        downloader_for: Callable[[str], VideoDownloader] = get_downloader,
+        index: FingerprintIndex | None = None,
+        fingerprinter: VideoFingerprinter | None = None,
+    ):
+        self.adapter = adapter
+        self.extractor = extractor or FrameExtractor(resize_width=512)
+        self.transcriber = transcriber or AudioTranscriber()
+        self.downloader_for = downloader_for
+        self.index = index
+        self.fingerprinter = fingerprinter or VideoFingerprinter()
+
+    def run(self, url: str) -> Recipe:
+        """Download the video, extract a recipe from it and clean up."""
+        downloader = self.downloader_for(url)
+        video_info = downloader.download(url)
+        try:
+            fingerprint = None
+            if self.index is not None:
+                fingerprint = self.fingerprinter.fingerprint(video_info.file_path)
+                match = self.index.lookup(fingerprint)
+                if match:
+                    return match.recipe.model_copy(update={"source_url": video_info.url})
+
+            frames = self.extractor.extract(str(video_info.file_path))
+            transcript = self.transcriber.process_video(video_info.file_path)
+            recipe = self.adapter.analyze_recipe(video_info, frames, transcript)
+
+            if fingerprint is not None:
+                self.index.add(fingerprint, recipe)
+            return recipe
+        finally:
+            downloader.cleanup(video_info)
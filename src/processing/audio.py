@@ -25,20 +25,19 @@ class AudioTranscriber:
         self._client = OpenAI(
             api_key=os.getenv("OPENAI_API_KEY"),
         )
-        self._temp_audio: Path | None = None
     
     def extract_audio(self, video_path: str | Path) -> Path:
         """
         Extract audio track from video file using ffmpeg.
         
-        Returns path to temporary MP3 file.
+        Returns path to a temporary MP3 file, which the caller must delete.
         """
         video_path = Path(video_path)
         
         # Create temp file for audio
         temp_fd, temp_path = tempfile.mkstemp(suffix=".mp3")
         os.close(temp_fd)
-        self._temp_audio = Path(temp_path)
+        audio_path = Path(temp_path)
         
         # Extract audio with ffmpeg
         cmd = [
@@ -48,7 +47,7 @@ class AudioTranscriber:
             "-acodec", "libmp3lame",  # MP3 codec
             "-q:a", "4",              # Quality (0-9, lower is better)
             "-y",                     # Overwrite output
-            str(self._temp_audio)
+            str(audio_path)
         ]
         
         result = subprocess.run(
@@ -58,9 +57,10 @@ class AudioTranscriber:
         )
         
         if result.returncode != 0:
+            audio_path.unlink(missing_ok=True)
             raise RuntimeError(f"ffmpeg failed: {result.stderr}")
         
-        return self._temp_audio
+        return audio_path
     
     def transcribe(self, audio_path: str | Path) -> str | None:
         """
@@ -118,15 +118,11 @@ class AudioTranscriber:
         
         Returns transcript if meaningful speech found, None otherwise.
         """
+        audio_path = None
         try:
             audio_path = self.extract_audio(video_path)
             return self.transcribe(audio_path)
         finally:
-            self.cleanup()
-    
-    def cleanup(self) -> None:
-        """Remove temporary audio file."""
-        if self._temp_audio and self._temp_audio.exists():
-            self._temp_audio.unlink()
-            self._temp_audio = None
-
+            # Temp files are per call, so concurrent calls on one instance are safe
+            if audio_path and audio_path.exists():
+                audio_path.unlink()
@@ -0,0 +1,140 @@
+"""
+Perceptual fingerprints for spotting re-uploads of the same video.
+
+A fingerprint is a handful of 64-bit difference hashes (dHash) of evenly
+spaced frames plus a coarse 64-bit audio energy hash. Both survive
+re-encoding, resizing and volume changes, and compare by Hamming distance.
+"""
+from __future__ import annotations
+
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+
+HASH_BITS = 64
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+@dataclass
+class Fingerprint:
+    frame_hashes: list[int]
+    audio_hash: Optional[int] = None
+    duration_seconds: float = 0.0
+
+    # Flat frames (black intros, fades) hash to nearly all zeros and would
+    # match every other video, so they are left out of comparisons
+    informative_hashes: list[int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.informative_hashes = [h for h in self.frame_hashes if 4 <= bin(h).count("1") <= HASH_BITS - 4]
+
+    def to_dict(self) -> dict:
+        return {
+            "frame_hashes": self.frame_hashes,
+            "audio_hash": self.audio_hash,
+            "duration_seconds": self.duration_seconds,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Fingerprint":
+        return cls(
+            frame_hashes=[int(h) for h in data["frame_hashes"]],
+            audio_hash=data.get("audio_hash"),
+            duration_seconds=float(data.get("duration_seconds", 0.0)),
+        )
+
+
+class VideoFingerprinter:
+    """Compute a Fingerprint from a video file without any API calls."""
+
+    def __init__(self, frame_samples: int = 16, audio_sample_rate: int = 4000):
+        self.frame_samples = frame_samples
+        self.audio_sample_rate = audio_sample_rate
+
+    def fingerprint(self, video_path: str | Path) -> Fingerprint:
+        frame_hashes, duration = self._frame_hashes(str(video_path))
+        return Fingerprint(
+            frame_hashes=frame_hashes,
+            audio_hash=self._audio_hash(str(video_path)),
+            duration_seconds=duration,
+        )
+
+    def _frame_hashes(self, video_path: str) -> tuple[list[int], float]:
+        """dHash of `frame_samples` frames spread evenly across the video."""
+        vid = cv2.VideoCapture(video_path)
+        if not vid.isOpened():
+            raise FileNotFoundError(f"Video file is not found at {video_path}")
+
+        hashes = []
+        try:
+            fps = vid.get(cv2.CAP_PROP_FPS)
+            frame_count = int(vid.get(cv2.CAP_PROP_FRAME_COUNT))
+            duration = frame_count / fps if fps else 0.0
+
+            # Sample mid-segment positions so we skip the very first/last frames
+            positions = sorted({int((i + 0.5) * frame_count / self.frame_samples) for i in range(self.frame_samples)})
+            for pos in positions:
+                vid.set(cv2.CAP_PROP_POS_FRAMES, pos)
+                success, frame = vid.read()
+                if not success:
+                    continue
+                hashes.append(self._dhash(frame))
+        finally:
+            vid.release()
+
+        return hashes, duration
+
+    @staticmethod
+    def _dhash(frame: np.ndarray) -> int:
+        """64-bit difference hash: is each pixel brighter than its right neighbour?"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+        bits = (small[:, 1:] > small[:, :-1]).flatten()
+        return int("".join("1" if b else "0" for b in bits), 2)
+
+    def _audio_hash(self, video_path: str) -> int | None:
+        """
+        Coarse audio hash: split the track into 65 windows and record whether
+        the energy goes up or down between neighbours.
+
+        Returns None if the video has no (or too little) audio, or ffmpeg is missing.
+        """
+        cmd = [
+            "ffmpeg",
+            "-i", video_path,
+            "-vn",                               # No video
+            "-ac", "1",                          # Mono
+            "-ar", str(self.audio_sample_rate),  # Low sample rate is plenty for energy
+            "-f", "s16le",                       # Raw PCM to stdout
+            "-",
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True)
+        except FileNotFoundError:
+            return None  # No ffmpeg: fall back to visual-only matching
+        if result.returncode != 0:
+            return None
+
+        return energy_hash(np.frombuffer(result.stdout, dtype=np.int16))
+
+
+def energy_hash(samples: np.ndarray) -> int | None:
+    """Hash PCM samples by whether energy rises or falls across 65 equal windows."""
+    samples = samples.astype(np.float64)
+    windows = HASH_BITS + 1
+    if len(samples) < windows * 100:
+        return None
+
+    energy = np.array([np.mean(chunk ** 2) for chunk in np.array_split(samples, windows)])
+    if not energy.any():
+        return None  # Silent track
+    bits = energy[1:] > energy[:-1]
+    return int("".join("1" if b else "0" for b in bits), 2)
@@ -0,0 +1,83 @@
+"""
+Run the recipe extraction service.
+
+    python -m src.service --port 8000 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import signal
+
+from ..fingerprint_index import FingerprintIndex
+from ..pipeline import RecipePipeline
+from ..vlm.openrouter import OpenRouterAdapter
+from .jobs import JobQueue
+from .server import RecipeService
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Async recipe extraction service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=2, help="Concurrent pipeline runs")
+    parser.add_argument("--max-queue", type=int, default=100, help="Pending videos before submissions are rejected")
+    parser.add_argument("--max-jobs-per-video", type=int, default=100, help="Pending duplicate submissions of one video before more are rejected")
+    parser.add_argument("--model", default="qwen/qwen2.5-vl-72b-instruct", help="OpenRouter model id")
+    parser.add_argument("--fingerprint-index", default=None, help="JSON-lines file to persist video fingerprints (in memory if omitted)")
+    parser.add_argument("--match-threshold", type=float, default=0.9, help="Fingerprint confidence needed to reuse a recipe")
+    parser.add_argument("--no-fingerprint", action="store_true", help="Disable re-upload detection")
+    parser.add_argument(
+        "--no-drain",
+        action="store_true",
+        help="Cancel queued jobs on shutdown. By default shutdown waits for the whole queue; "
+             "a second Ctrl-C cancels what is still queued",
+    )
+    return parser.parse_args()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    index = None
+    if not args.no_fingerprint:
+        index = FingerprintIndex(args.fingerprint_index, threshold=args.match_threshold)
+    pipeline = RecipePipeline(adapter=OpenRouterAdapter(model=args.model), index=index)
+    queue = JobQueue(
+        pipeline.run,
+        workers=args.workers,
+        max_queue=args.max_queue,
+        max_jobs_per_video=args.max_jobs_per_video,
+    )
+    service = RecipeService(queue, host=args.host, port=args.port)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    signals = (signal.SIGINT, signal.SIGTERM)
+
+    def on_signal() -> None:
+        if not stop.is_set():
+            stop.set()
+            return
+        # Second signal: stop draining, and hand signals back so a third one
+        # interrupts immediately
+        cancelled = queue.cancel_pending()
+        print(f"Cancelled {cancelled} queued jobs, waiting for running ones (signal again to interrupt)...")
+        for sig in signals:
+            loop.remove_signal_handler(sig)
+
+    for sig in signals:
+        loop.add_signal_handler(sig, on_signal)
+
+    await service.start()
+    print(f"Serving on http://{service.host}:{service.port} with {args.workers} workers")
+    await stop.wait()
+
+    if args.no_drain:
+        print("Shutting down, waiting for running jobs...")
+    else:
+        print(f"Shutting down, finishing {queue.metrics()['queue_depth']} queued jobs (signal again to cancel them)...")
+    await service.stop(drain=not args.no_drain)
+    print("Done!")
+
+
+if __name__ == "__main__":
+    asyncio.run(serve(parse_args()))
@@ -0,0 +1,288 @@
+"""
+Bounded async job queue with single-flight deduplication.
+
+Jobs are keyed by canonical video URL. While a video is queued or running,
+further submissions for it attach to the same flight instead of queueing a
+second pipeline run, so they all get the same Recipe (or the same error).
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from ..downloaders.canonical import canonical_url
+from ..schemas import Recipe
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a new video is submitted while the queue is at capacity."""
+
+
+class ServiceClosedError(RuntimeError):
+    """Raised when submitting to a queue that is shutting down."""
+
+
+@dataclass
+class Job:
+    id: str
+    url: str
+    key: str
+    status: str = "queued"  # queued | running | done | failed | cancelled
+    submitted_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    recipe: Optional[Recipe] = None
+    error: Optional[str] = None
+    deduplicated: bool = False
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    def to_dict(self) -> dict:
+        """Status view of the job (without the recipe itself)."""
+        return {
+            "job_id": self.id,
+            "url": self.url,
+            "status": self.status,
+            "deduplicated": self.deduplicated,
+            "error": self.error,
+            "queue_seconds": _elapsed(self.submitted_at, self.started_at),
+            "run_seconds": _elapsed(self.started_at, self.finished_at),
+        }
+
+
+@dataclass
+class _Flight:
+    """One pipeline run shared by every job for the same canonical video."""
+    key: str
+    url: str
+    jobs: list[Job] = field(default_factory=list)
+
+
+class LatencyWindow:
+    """Rolling window of durations for summary stats."""
+
+    def __init__(self, size: int = 1000):
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def summary(self) -> dict:
+        if not self._samples:
+            return {"count": 0, "avg": None, "p50": None, "p95": None, "max": None}
+        ordered = sorted(self._samples)
+        return {
+            "count": len(ordered),
+            "avg": round(sum(ordered) / len(ordered), 4),
+            "p50": round(_percentile(ordered, 0.50), 4),
+            "p95": round(_percentile(ordered, 0.95), 4),
+            "max": round(ordered[-1], 4),
+        }
+
+
+class JobQueue:
+    """
+    Run a blocking `runner(url) -> Recipe` on a pool of async workers.
+
+    The runner executes in a thread (see asyncio.to_thread) so the event loop
+    stays free to answer submit/poll requests while pipelines run.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[str], Recipe],
+        workers: int = 2,
+        max_queue: int = 100,
+        max_finished_jobs: int = 1000,
+        max_jobs_per_video: int = 100,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+        if max_jobs_per_video < 1:
+            raise ValueError("max_jobs_per_video must be at least 1")
+        self._runner = runner
+        self._worker_count = workers
+        self._queue: asyncio.Queue[_Flight] = asyncio.Queue(maxsize=max_queue)
+        self._in_flight: dict[str, _Flight] = {}
+        self._jobs: dict[str, Job] = {}
+        # Finished job ids, oldest first, so memory stays bounded
+        self._finished: OrderedDict[str, None] = OrderedDict()
+        self._max_finished = max_finished_jobs
+        # Duplicate submissions need no queue slot, so bound them separately
+        self._max_jobs_per_video = max_jobs_per_video
+        self._workers: list[asyncio.Task] = []
+        self._running = 0
+        self._closing = False
+        self._counters = {
+            "submitted": 0,
+            "deduplicated": 0,
+            "rejected": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+        }
+        self._queue_latency = LatencyWindow()
+        self._run_latency = LatencyWindow()
+
+    def start(self) -> None:
+        """Spawn the worker tasks. Must be called from a running event loop."""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"recipe-worker-{i}")
+            for i in range(self._worker_count)
+        ]
+
+    def submit(self, url: str) -> Job:
+        """
+        Queue a URL for extraction and return its Job.
+
+        Joins the in-flight run if the same video is already queued or running.
+        Raises QueueFullError / ServiceClosedError if the job can't be accepted.
+        """
+        if self._closing:
+            raise ServiceClosedError("Service is shutting down")
+
+        key = canonical_url(url)
+        job = Job(id=uuid.uuid4().hex, url=url, key=key)
+
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            if len(flight.jobs) >= self._max_jobs_per_video:
+                self._counters["rejected"] += 1
+                raise QueueFullError(f"Too many pending jobs for this video ({self._max_jobs_per_video})")
+            job.deduplicated = True
+            if flight.jobs[0].started_at is not None:
+                # Joined a run already in progress: no queue wait of its own
+                job.status = "running"
+                job.started_at = job.submitted_at
+            self._counters["deduplicated"] += 1
+        else:
+            flight = _Flight(key=key, url=url)
+            try:
+                self._queue.put_nowait(flight)
+            except asyncio.QueueFull:
+                self._counters["rejected"] += 1
+                raise QueueFullError(f"Queue is full ({self._queue.maxsize} videos pending)") from None
+            self._in_flight[key] = flight
+
+        flight.jobs.append(job)
+        self._jobs[job.id] = job
+        self._counters["submitted"] += 1
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def metrics(self) -> dict:
+        return {
+            "workers": self._worker_count,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "running": self._running,
+            "in_flight_videos": len(self._in_flight),
+            "closing": self._closing,
+            **self._counters,
+            "queue_latency_seconds": self._queue_latency.summary(),
+            "run_latency_seconds": self._run_latency.summary(),
+        }
+
+    async def shutdown(self, drain: bool = True) -> None:
+        """
+        Stop accepting jobs and wind down the workers.
+
+        With drain=True every queued video is still processed. Otherwise queued
+        videos are cancelled. Runs already in progress always finish. If the
+        workers were never started, queued videos are cancelled since nothing
+        could ever process them.
+        """
+        self._closing = True
+        if not drain or not self._workers:
+            self.cancel_pending()
+        await self._queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def cancel_pending(self) -> int:
+        """
+        Cancel every queued (not yet running) video and return how many.
+
+        Safe to call during a draining shutdown to stop it waiting for the queue.
+        """
+        cancelled = 0
+        while not self._queue.empty():
+            flight = self._queue.get_nowait()
+            self._finish(flight, status="cancelled", error="Service shut down before the job started")
+            self._queue.task_done()
+            cancelled += 1
+        return cancelled
+
+    async def _worker(self) -> None:
+        while True:
+            flight = await self._queue.get()
+            try:
+                await self._run(flight)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, flight: _Flight) -> None:
+        started = time.monotonic()
+        for job in flight.jobs:
+            job.status = "running"
+            job.started_at = started
+            self._queue_latency.add(started - job.submitted_at)
+
+        self._running += 1
+        try:
+            recipe = await asyncio.to_thread(self._runner, flight.url)
+        except Exception as e:
+            self._finish(flight, status="failed", error=f"{type(e).__name__}: {e}")
+        else:
+            self._finish(flight, status="done", recipe=recipe)
+        finally:
+            self._running -= 1
+            self._run_latency.add(time.monotonic() - started)
+
+    def _finish(
+        self,
+        flight: _Flight,
+        status: str,
+        recipe: Recipe | None = None,
+        error: str | None = None,
+    ) -> None:
+        # Drop the flight first so later submissions start a fresh run
+        self._in_flight.pop(flight.key, None)
+        finished = time.monotonic()
+        counter = {"done": "completed"}.get(status, status)
+        for job in flight.jobs:
+            job.status = status
+            job.recipe = recipe
+            job.error = error
+            job.finished_at = finished
+            self._counters[counter] += 1
+            self._finished[job.id] = None
+
+        while len(self._finished) > self._max_finished:
+            old_id, _ = self._finished.popitem(last=False)
+            self._jobs.pop(old_id, None)
+
+
+def _elapsed(start: float | None, end: float | None) -> float | None:
+    if start is None:
+        return None
+    return round((end if end is not None else time.monotonic()) - start, 4)
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
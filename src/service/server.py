@@ -0,0 +1,169 @@
+"""
+Minimal async HTTP front-end for the JobQueue.
+
+Endpoints (all JSON):
+    POST /jobs                  {"url": "..."} -> 202 with job status
+    GET  /jobs/<job_id>         job status
+    GET  /jobs/<job_id>/result  200 recipe, 202 while pending, 422 if failed
+    GET  /metrics               queue depth, counters and latency stats
+    GET  /health                liveness check
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from http import HTTPStatus
+
+from .jobs import JobQueue, QueueFullError, ServiceClosedError
+
+MAX_BODY_BYTES = 64 * 1024
+# Slow or idle clients get this long to send a full request
+REQUEST_TIMEOUT_SECONDS = 10.0
+
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class RecipeService:
+    """Serve a JobQueue over HTTP using asyncio streams (no extra dependencies)."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        request_timeout: float = REQUEST_TIMEOUT_SECONDS,
+    ):
+        self.queue = queue
+        self.host = host
+        self.port = port
+        self.request_timeout = request_timeout
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Start the workers and begin listening."""
+        self.queue.start()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Pick up the real port when started with port=0
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self, drain: bool = True) -> None:
+        """Stop listening, then let the queue finish (or cancel) its work."""
+        if self._server:
+            self._server.close()
+            # wait_closed() waits for open connections (Python 3.12+), so an
+            # idle client would otherwise block shutdown
+            connections = list(self._connections)
+            for task in connections:
+                task.cancel()
+            await asyncio.gather(*connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        await self.queue.shutdown(drain=drain)
+
+    def handle(self, method: str, path: str, body: bytes) -> tuple[HTTPStatus, dict]:
+        """Route a single request. Separate from the socket code so it is easy to test."""
+        parts = [p for p in path.split("?")[0].split("/") if p]
+
+        if parts == ["health"] and method == "GET":
+            return HTTPStatus.OK, {"status": "ok"}
+
+        if parts == ["metrics"] and method == "GET":
+            return HTTPStatus.OK, self.queue.metrics()
+
+        if parts == ["jobs"] and method == "POST":
+            url = _parse_submit(body)
+            try:
+                job = self.queue.submit(url)
+            except (QueueFullError, ServiceClosedError) as e:
+                raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, str(e))
+            return HTTPStatus.ACCEPTED, job.to_dict()
+
+        if len(parts) in (2, 3) and parts[0] == "jobs" and method == "GET":
+            job = self.queue.get(parts[1])
+            if job is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown job: {parts[1]}")
+            if len(parts) == 2:
+                return HTTPStatus.OK, job.to_dict()
+            if parts[2] == "result":
+                if job.status == "done":
+                    return HTTPStatus.OK, job.recipe.model_dump(mode="json")
+                if job.finished:
+                    return HTTPStatus.UNPROCESSABLE_ENTITY, job.to_dict()
+                return HTTPStatus.ACCEPTED, job.to_dict()
+
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {method} {path}")
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            try:
+                method, path, body = await asyncio.wait_for(_read_request(reader), timeout=self.request_timeout)
+                status, payload = self.handle(method, path, body)
+            except asyncio.TimeoutError:
+                status, payload = HTTPStatus.REQUEST_TIMEOUT, {"error": "Timed out waiting for the request"}
+            except HTTPError as e:
+                status, payload = e.status, {"error": e.message}
+            except Exception as e:
+                status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+            _write_response(writer, status, payload)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+
+def _parse_submit(body: bytes) -> str:
+    try:
+        data = json.loads(body or b"{}")
+    except json.JSONDecodeError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be JSON")
+    url = data.get("url") if isinstance(data, dict) else None
+    if not isinstance(url, str) or not url.strip():
+        raise HTTPError(HTTPStatus.BAD_REQUEST, 'Body must look like {"url": "..."}')
+    return url.strip()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> tuple[str, str, bytes]:
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    try:
+        method, path, _ = request_line.split(" ", 2)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+    body = await reader.readexactly(length) if length > 0 else b""
+    return method.upper(), path, body
+
+
+def _write_response(writer: asyncio.StreamWriter, status: HTTPStatus, payload: dict) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n"
+        "\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
@@ -0,0 +1,71 @@
+"""
+Shared stub pipeline stages, so tests run without network or API keys.
+"""
+from pathlib import Path
+
+import pytest
+
+from src.downloaders.base import VideoInfo
+from src.schemas import Recipe
+
+
+class StubDownloader:
+    """Pretends to download any URL and records what it was asked to do."""
+
+    def __init__(self):
+        self.downloads = []
+        self.cleaned = []
+
+    def supports(self, url: str) -> bool:
+        return True
+
+    def download(self, url: str) -> VideoInfo:
+        self.downloads.append(url)
+        return VideoInfo(title="Stub", file_path=Path("/tmp/stub.mp4"), url=url, duration_seconds=30)
+
+    def cleanup(self, video_info: VideoInfo) -> None:
+        self.cleaned.append(video_info.url)
+
+
+class StubExtractor:
+    def extract(self, video_path: str) -> list[str]:
+        return ["frame"]
+
+
+class StubTranscriber:
+    def __init__(self):
+        self.calls = 0
+
+    def process_video(self, video_path) -> str | None:
+        self.calls += 1
+        return None
+
+
+def build_recipe(title: str = "Eggs", source_url: str | None = None) -> Recipe:
+    return Recipe(
+        title=title,
+        ingredients=[{"name": "egg", "quantity": 2, "unit": "whole"}],
+        steps=[{"order": 1, "instruction": "Boil"}],
+        servings=1,
+        source_url=source_url,
+    )
+
+
+@pytest.fixture
+def downloader() -> StubDownloader:
+    return StubDownloader()
+
+
+@pytest.fixture
+def extractor() -> StubExtractor:
+    return StubExtractor()
+
+
+@pytest.fixture
+def transcriber() -> StubTranscriber:
+    return StubTranscriber()
+
+
+@pytest.fixture
+def make_recipe():
+    return build_recipe
@@ -0,0 +1,196 @@
+"""
+Tests for re-upload detection: fingerprints, the Hamming index and the
+pipeline short-circuit, using synthetic videos and stub stages.
+"""
+import random
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.fingerprint_index import BKTree, FingerprintIndex
+from src.pipeline import RecipePipeline
+from src.processing.fingerprint import Fingerprint, VideoFingerprinter, energy_hash, hamming
+from src.schemas import Recipe
+
+
+def write_video(path: Path, seed: int, width: int = 320, height: int = 240, frames: int = 48) -> Path:
+    """Write a short video of random blocks that change every few frames."""
+    rng = np.random.default_rng(seed)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 24, (width, height))
+    for i in range(frames):
+        if i % 6 == 0:
+            blocks = rng.integers(0, 255, size=(6, 8, 3), dtype=np.uint8)
+            image = cv2.resize(blocks, (width, height), interpolation=cv2.INTER_NEAREST)
+        writer.write(image)
+    writer.release()
+    return path
+
+
+def random_hashes(seed: int, count: int = 8) -> list[int]:
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(count)]
+
+
+def flip_bits(value: int, bits: int) -> int:
+    """Flip the lowest `bits` bits, i.e. a hash exactly `bits` away."""
+    return value ^ ((1 << bits) - 1)
+
+
+def test_bktree_matches_linear_scan():
+    values = random_hashes(seed=0, count=500)
+    tree = BKTree()
+    for entry_id, value in enumerate(values):
+        tree.add(value, entry_id)
+
+    query = values[42] ^ 0b1011  # 3 bits away from a stored hash
+    expected = sorted((hamming(query, v), i) for i, v in enumerate(values) if hamming(query, v) <= 12)
+    assert sorted(tree.search(query, 12)) == expected
+    assert (3, 42) in expected
+
+
+def test_reencoded_video_matches_and_different_video_does_not(tmp_path, make_recipe):
+    fingerprinter = VideoFingerprinter(frame_samples=8)
+    original = fingerprinter.fingerprint(write_video(tmp_path / "a.mp4", seed=1))
+    reupload = fingerprinter.fingerprint(write_video(tmp_path / "b.mp4", seed=1, width=480, height=360))
+    other = fingerprinter.fingerprint(write_video(tmp_path / "c.mp4", seed=2))
+
+    index = FingerprintIndex()
+    index.add(original, make_recipe())
+
+    match = index.lookup(reupload)
+    assert match is not None and match.recipe.title == "Eggs"
+    assert match.confidence >= index.threshold
+    assert index.lookup(other) is None
+
+
+def test_flat_frames_and_duration_gate(make_recipe):
+    flat = Fingerprint(frame_hashes=[0, 0, 2**64 - 1])
+    assert flat.informative_hashes == []
+
+    index = FingerprintIndex()
+    hashes = [0x0F0F0F0F0F0F0F0F, 0x00FF00FF00FF00FF]
+    index.add(Fingerprint(frame_hashes=hashes, duration_seconds=60), make_recipe())
+    assert index.lookup(flat) is None
+    assert index.lookup(Fingerprint(frame_hashes=hashes, duration_seconds=61)) is not None
+    assert index.lookup(Fingerprint(frame_hashes=hashes, duration_seconds=120)) is None
+
+
+def test_shared_static_shot_does_not_match(make_recipe):
+    """A video that is all one counter-top shot must not match another video containing that shot."""
+    counter_top = 0x0F0F0F0F0F0F0F0F
+    static_video = Fingerprint(frame_hashes=[counter_top] * 8, duration_seconds=30)
+    other_video = Fingerprint(frame_hashes=[counter_top] + random_hashes(seed=3, count=7), duration_seconds=30)
+
+    index = FingerprintIndex()
+    index.add(other_video, make_recipe())
+    assert index.lookup(static_video) is None
+    assert index.similarity(static_video, other_video) == index.similarity(other_video, static_video)
+
+
+def test_audio_confirms_near_miss_only_when_tracks_agree():
+    index = FingerprintIndex()
+    frames = random_hashes(seed=4)
+    audio = random_hashes(seed=5, count=1)[0]
+    stored = Fingerprint(frame_hashes=frames, audio_hash=audio, duration_seconds=30)
+    # Every frame 7 bits off: visual score ~0.89, just under the threshold
+    near_miss = [flip_bits(h, 7) for h in frames]
+
+    same_audio = Fingerprint(frame_hashes=near_miss, audio_hash=audio, duration_seconds=30)
+    different_audio = Fingerprint(frame_hashes=near_miss, audio_hash=~audio & (2**64 - 1), duration_seconds=30)
+    no_audio = Fingerprint(frame_hashes=near_miss, duration_seconds=30)
+
+    visual = index.similarity(no_audio, stored)
+    assert visual < index.threshold
+    assert index.similarity(same_audio, stored) >= index.threshold
+    assert index.similarity(different_audio, stored) == visual
+
+
+def test_trimmed_audio_does_not_block_visual_match(make_recipe):
+    rng = np.random.default_rng(6)
+    # 30s of noise at 4kHz under a slowly varying envelope
+    envelope = np.repeat(rng.uniform(0.1, 1.0, size=300), 400)
+    samples = (rng.normal(size=envelope.size) * envelope * 8000).astype(np.int16)
+    original_audio = energy_hash(samples)
+    trimmed_audio = energy_hash(samples[len(samples) // 20:])  # First 1.5s cut
+    assert original_audio is not None and trimmed_audio is not None
+
+    frames = random_hashes(seed=7)
+    index = FingerprintIndex()
+    index.add(Fingerprint(frame_hashes=frames, audio_hash=original_audio, duration_seconds=30), make_recipe())
+
+    trimmed = Fingerprint(frame_hashes=frames, audio_hash=trimmed_audio, duration_seconds=28.5)
+    match = index.lookup(trimmed)
+    assert match is not None and match.confidence >= index.threshold
+
+
+def test_index_persists(tmp_path, make_recipe):
+    path = tmp_path / "index.jsonl"
+    index = FingerprintIndex(path)
+    pancakes = Fingerprint(frame_hashes=[0x0F0F0F0F0F0F0F0F], audio_hash=0x1234567890ABCDEF, duration_seconds=30)
+    waffles = Fingerprint(frame_hashes=[0x00FF00FF00FF00FF], duration_seconds=90)
+    index.add(pancakes, make_recipe("Pancakes"))
+    index.add(waffles, make_recipe("Waffles"))
+    # Each add appends one line rather than rewriting the file
+    assert len(path.read_text().splitlines()) == 2
+
+    with path.open("a") as f:
+        f.write('{"fingerprint": ')  # Simulate a crash mid-append
+    reloaded = FingerprintIndex(path)
+    assert len(reloaded) == 2
+    assert reloaded.lookup(pancakes).recipe.title == "Pancakes"
+    assert reloaded.lookup(waffles).recipe.title == "Waffles"
+
+    # Appends after the crash are still readable
+    toast = Fingerprint(frame_hashes=[0x3C3C3C3C3C3C3C3C], duration_seconds=10)
+    reloaded.add(toast, make_recipe("Toast"))
+    assert len(FingerprintIndex(path)) == 3
+
+
+def test_flat_fingerprints_are_not_stored(tmp_path, make_recipe):
+    path = tmp_path / "index.jsonl"
+    index = FingerprintIndex(path)
+    index.add(Fingerprint(frame_hashes=[0, 2**64 - 1]), make_recipe())
+    assert len(index) == 0
+    assert not path.exists()
+
+
+class StubFingerprinter:
+    """Every download looks like the same video."""
+
+    def fingerprint(self, video_path) -> Fingerprint:
+        return Fingerprint(frame_hashes=[0x0F0F0F0F0F0F0F0F, 0x00FF00FF00FF00FF], duration_seconds=30)
+
+
+class CountingAdapter:
+    def __init__(self, make_recipe):
+        self.calls = 0
+        self._make_recipe = make_recipe
+
+    @property
+    def model_name(self) -> str:
+        return "stub"
+
+    def analyze_recipe(self, video_info, frames, transcript=None) -> Recipe:
+        self.calls += 1
+        return self._make_recipe()
+
+
+def test_pipeline_reuses_recipe_for_reupload(downloader, extractor, transcriber, make_recipe):
+    adapter = CountingAdapter(make_recipe)
+    pipeline = RecipePipeline(
+        adapter=adapter,
+        extractor=extractor,
+        transcriber=transcriber,
+        downloader_for=lambda url: downloader,
+        index=FingerprintIndex(),
+        fingerprinter=StubFingerprinter(),
+    )
+
+    first = pipeline.run("https://youtu.be/aaaaaaaaaaa")
+    second = pipeline.run("https://youtu.be/bbbbbbbbbbb")
+
+    assert transcriber.calls == 1 and adapter.calls == 1
+    assert second.title == first.title
+    assert second.source_url == "https://youtu.be/bbbbbbbbbbb"
+    assert downloader.cleaned == downloader.downloads
@@ -0,0 +1,275 @@
+"""
+Tests for the async extraction service, using stub downloader / VLM stages
+so nothing touches the network.
+"""
+import asyncio
+import json
+import threading
+
+import pytest
+
+from src.downloaders.canonical import canonical_url
+from src.pipeline import RecipePipeline
+from src.schemas import Recipe
+from src.service.jobs import JobQueue, QueueFullError, ServiceClosedError
+from src.service.server import RecipeService
+
+
+class StubAdapter:
+    """VLMAdapter that blocks until released, so tests control run timing."""
+
+    def __init__(self, make_recipe):
+        self.calls = 0
+        self.release = threading.Event()
+        self._make_recipe = make_recipe
+
+    @property
+    def model_name(self) -> str:
+        return "stub"
+
+    def analyze_recipe(self, video_info, frames, transcript=None) -> Recipe:
+        self.calls += 1
+        self.release.wait(timeout=5)
+        return self._make_recipe(f"Recipe {video_info.title}", source_url=video_info.url)
+
+
+@pytest.fixture
+def stub_pipeline(downloader, extractor, transcriber, make_recipe):
+    adapter = StubAdapter(make_recipe)
+    pipeline = RecipePipeline(
+        adapter=adapter,
+        extractor=extractor,
+        transcriber=transcriber,
+        downloader_for=lambda url: downloader,
+    )
+    return pipeline, downloader, adapter
+
+
+async def wait_for(predicate, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("Timed out waiting for condition")
+        await asyncio.sleep(0.01)
+
+
+def test_canonical_url_collapses_youtube_variants():
+    key = "youtube:jNQXAC9IVRw"
+    assert canonical_url("https://www.youtube.com/watch?v=jNQXAC9IVRw&si=abc") == key
+    assert canonical_url("https://youtu.be/jNQXAC9IVRw?t=3") == key
+    assert canonical_url("https://youtube.com/shorts/jNQXAC9IVRw") == key
+    assert canonical_url("https://m.youtube.com/watch?feature=share&v=jNQXAC9IVRw") == key
+    assert canonical_url("https://Example.com/a/?utm_source=x#frag") == "https://example.com/a"
+
+
+def test_canonical_url_without_scheme():
+    assert canonical_url("youtube.com/watch?v=jNQXAC9IVRw") == "youtube:jNQXAC9IVRw"
+    assert canonical_url("www.youtu.be/jNQXAC9IVRw") == "youtube:jNQXAC9IVRw"
+    assert canonical_url("example.com/recipe") == canonical_url("https://example.com/recipe")
+
+
+def test_concurrent_submissions_share_one_run(stub_pipeline):
+    async def scenario():
+        pipeline, downloader, adapter = stub_pipeline
+        queue = JobQueue(pipeline.run, workers=2, max_queue=10)
+        queue.start()
+
+        first = queue.submit("https://www.youtube.com/watch?v=jNQXAC9IVRw")
+        second = queue.submit("https://youtu.be/jNQXAC9IVRw")
+        await wait_for(lambda: first.status == "running")
+        third = queue.submit("https://youtube.com/shorts/jNQXAC9IVRw")
+
+        adapter.release.set()
+        await wait_for(lambda: all(j.finished for j in (first, second, third)))
+        await queue.shutdown()
+
+        assert adapter.calls == 1
+        assert len(downloader.downloads) == 1
+        assert downloader.cleaned == downloader.downloads
+        assert [j.deduplicated for j in (first, second, third)] == [False, True, True]
+        assert first.recipe is second.recipe is third.recipe
+        metrics = queue.metrics()
+        assert metrics["completed"] == 3
+        assert metrics["deduplicated"] == 2
+        assert metrics["run_latency_seconds"]["count"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_failed_run_is_reported_to_every_job():
+    def runner(url):
+        raise RuntimeError("download failed")
+
+    async def scenario():
+        queue = JobQueue(runner, workers=1)
+        queue.start()
+        jobs = [queue.submit("https://youtu.be/jNQXAC9IVRw") for _ in range(2)]
+        await wait_for(lambda: all(j.finished for j in jobs))
+        await queue.shutdown()
+        assert [j.status for j in jobs] == ["failed", "failed"]
+        assert "download failed" in jobs[0].error
+        assert queue.metrics()["failed"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_queue_full_and_shutdown(stub_pipeline):
+    async def scenario():
+        pipeline, _, adapter = stub_pipeline
+        queue = JobQueue(pipeline.run, workers=1, max_queue=1)
+        queue.start()
+
+        running = queue.submit("https://youtu.be/aaaaaaaaaaa")
+        await wait_for(lambda: running.status == "running")
+        queued = queue.submit("https://youtu.be/bbbbbbbbbbb")
+        with pytest.raises(QueueFullError):
+            queue.submit("https://youtu.be/ccccccccccc")
+        # Joining an in-flight video needs no queue slot
+        assert queue.submit("https://youtu.be/bbbbbbbbbbb").deduplicated
+
+        shutdown = asyncio.create_task(queue.shutdown(drain=False))
+        await wait_for(lambda: queued.status == "cancelled")
+        with pytest.raises(ServiceClosedError):
+            queue.submit("https://youtu.be/ddddddddddd")
+
+        adapter.release.set()
+        await shutdown
+        assert running.status == "done"
+        assert queue.metrics()["rejected"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_http_submit_poll_result(stub_pipeline):
+    async def request(port, method, path, payload=None):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        await writer.drain()
+        raw = await reader.read()
+        writer.close()
+        head, _, data = raw.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(data)
+
+    async def scenario():
+        pipeline, _, adapter = stub_pipeline
+        service = RecipeService(JobQueue(pipeline.run, workers=1), port=0)
+        await service.start()
+
+        status, job = await request(service.port, "POST", "/jobs", {"url": "https://youtu.be/jNQXAC9IVRw"})
+        assert status == 202
+        status, _ = await request(service.port, "GET", f"/jobs/{job['job_id']}/result")
+        assert status == 202
+
+        adapter.release.set()
+        await wait_for(lambda: service.queue.get(job["job_id"]).finished)
+        status, recipe = await request(service.port, "GET", f"/jobs/{job['job_id']}/result")
+        assert status == 200
+        assert recipe["title"] == "Recipe Stub"
+
+        assert (await request(service.port, "POST", "/jobs", {"nope": 1}))[0] == 400
+        assert (await request(service.port, "GET", "/jobs/missing"))[0] == 404
+        status, metrics = await request(service.port, "GET", "/metrics")
+        assert status == 200 and metrics["queue_depth"] == 0
+
+        await service.stop()
+
+    asyncio.run(scenario())
+
+
+def test_job_joining_running_flight_has_no_negative_queue_time(stub_pipeline):
+    async def scenario():
+        pipeline, _, adapter = stub_pipeline
+        queue = JobQueue(pipeline.run, workers=1)
+        queue.start()
+
+        first = queue.submit("https://youtu.be/jNQXAC9IVRw")
+        await wait_for(lambda: first.status == "running")
+        await asyncio.sleep(0.02)
+        late = queue.submit("https://youtu.be/jNQXAC9IVRw")
+        assert late.to_dict()["queue_seconds"] == 0
+
+        adapter.release.set()
+        await wait_for(lambda: late.finished)
+        await queue.shutdown()
+        assert late.to_dict()["run_seconds"] < first.to_dict()["run_seconds"]
+
+    asyncio.run(scenario())
+
+
+def test_shutdown_without_start_cancels_queued_jobs(stub_pipeline):
+    async def scenario():
+        pipeline, _, _ = stub_pipeline
+        queue = JobQueue(pipeline.run, workers=1)
+        job = queue.submit("https://youtu.be/jNQXAC9IVRw")
+        await asyncio.wait_for(queue.shutdown(), timeout=1)
+        assert job.status == "cancelled"
+
+    asyncio.run(scenario())
+
+
+def test_stop_does_not_hang_on_idle_or_slow_clients(stub_pipeline):
+    async def scenario():
+        pipeline, _, _ = stub_pipeline
+        service = RecipeService(JobQueue(pipeline.run, workers=1), port=0, request_timeout=0.2)
+        await service.start()
+
+        # A client that stalls mid-request gets a 408
+        reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+        writer.write(b"GET /health HTTP/1.1\r\n")
+        raw = await asyncio.wait_for(reader.read(), timeout=2)
+        assert raw.split()[1] == b"408"
+        writer.close()
+
+        # A client that never sends anything must not block shutdown
+        service.request_timeout = 60
+        _, idle = await asyncio.open_connection("127.0.0.1", service.port)
+        await asyncio.sleep(0.05)
+        await asyncio.wait_for(service.stop(), timeout=3)
+        idle.close()
+
+    asyncio.run(scenario())
+
+
+def test_cancel_pending_cuts_a_draining_shutdown_short(stub_pipeline):
+    async def scenario():
+        pipeline, _, adapter = stub_pipeline
+        queue = JobQueue(pipeline.run, workers=1)
+        queue.start()
+
+        running = queue.submit("https://youtu.be/aaaaaaaaaaa")
+        await wait_for(lambda: running.status == "running")
+        queued = [queue.submit(f"https://youtu.be/{c * 11}") for c in "bcd"]
+
+        shutdown = asyncio.create_task(queue.shutdown(drain=True))
+        await asyncio.sleep(0.05)
+        assert not shutdown.done()
+        assert queue.cancel_pending() == 3
+
+        adapter.release.set()
+        await asyncio.wait_for(shutdown, timeout=2)
+        assert running.status == "done"
+        assert [j.status for j in queued] == ["cancelled"] * 3
+        assert adapter.calls == 1
+
+    asyncio.run(scenario())
+
+
+def test_duplicate_submissions_per_video_are_capped(stub_pipeline):
+    async def scenario():
+        pipeline, _, adapter = stub_pipeline
+        queue = JobQueue(pipeline.run, workers=1, max_jobs_per_video=3)
+        queue.start()
+
+        jobs = [queue.submit("https://youtu.be/jNQXAC9IVRw") for _ in range(3)]
+        with pytest.raises(QueueFullError):
+            queue.submit("https://youtu.be/jNQXAC9IVRw")
+        assert queue.metrics()["rejected"] == 1
+
+        adapter.release.set()
+        await wait_for(lambda: all(j.finished for j in jobs))
+        # Once the run finishes the video can be submitted again
+        queue.submit("https://youtu.be/jNQXAC9IVRw")
+        await queue.shutdown()
+
+    asyncio.run(scenario())